@@ -40,13 +40,13 @@ def parse_ris(ris_path:str, fill_none_doi:str = None):
     Returns:
         list: A list of dictionaries containing the parsed contents of the RIS file.
     """
-    with open(ris_path, 'r', encoding='utf-8') as bibliography_file:
+    # 1 MiB read buffer: RIS exports are read once, sequentially
+    with open(ris_path, 'r', encoding='utf-8', buffering=1 << 20) as bibliography_file:
         ris = rispy.load(bibliography_file)
-        if fill_none_doi is not None:
-            for r in ris:
-                if 'doi' not in r:
-                    r['doi'] = fill_none_doi
-        return ris
+    if fill_none_doi is not None:
+        for r in ris:
+            r.setdefault('doi', fill_none_doi)
+    return ris
     
     
 __all__ = [
@@ -60,7 +60,8 @@ __all__ = [
     'download_from_scihub_by_doi',
     'download_from_scihub_by_title',
     'download_by_scihub',
-    
+    'download_many_by_scihub',
+
     'has_sci_bookmarks',
     'get_sci_bookmarks_from_pdf',
     'get_section_bookmarks',
@@ -8,6 +8,7 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import statsmodels.api as sm
+from matplotlib.collections import LineCollection
 
 if __name__ == '__main__':
     # dev mode
@@ -41,12 +42,15 @@ def hex2rgb(hex:str):
   return [int(hex[i:i+2], 16) for i in (1, 3, 5)]
 def rgbs2hexs(rgbs:List[Tuple[float]]):
     """
-    Takes a list of RGB tuples and converts them to a list of hexadecimal color codes. 
-    Each RGB tuple must contain three floats between 0 and 1 representing the red, green, and blue 
+    Takes a list of RGB tuples and converts them to a list of hexadecimal color codes.
+    Each RGB tuple must contain three floats between 0 and 1 representing the red, green, and blue
     components of the color. Returns a list of hexadecimal color codes as strings.
     """
-    return list(map(lambda x : rgb2hex(*[int(x[i]*255) for i in range(3)]),
-                    rgbs))
+    if len(rgbs) == 0:
+        return []
+    arr = (np.asarray(rgbs)[:, :3] * 255).astype(np.uint8).astype(np.uint32)
+    packed = (arr[:, 0] << 16) | (arr[:, 1] << 8) | arr[:, 2]
+    return [f'#{v:06X}' for v in packed.tolist()]
     
 def get_palette(n:int = 10, mode:Union[None, str] = None, return_n = True) -> List[str]:
     """get a seq of hex colors    
@@ -194,24 +198,32 @@ def plot_turkey(means, std_errs, tukey_results, min_star = 1):
     For each combination of groups, the function checks if the corresponding Tukey's test result indicates a significant difference. If so, it plots a horizontal line at the maximum height, vertical lines at the endpoints, and places a text label with stars indicating the p-value of the difference.
     """
     x = np.arange(len(means))
-    plt.bar(x, means, yerr=std_errs, capsize=5)
+    ax = plt.gca()
+    ax.bar(x, means, yerr=std_errs, capsize=5)
 
-    combins = np.array(list(combinations(range(len(means)), 2)))
+    xi, xj = np.triu_indices(len(means), 1)
     height = max(means) + max(std_errs)
     min_height = 0.05 * height
     endpoint_height = [height - 0.05 * min_height, height + 0.05 * min_height]
-    for i, combination in enumerate(combins):
-        if tukey_results.reject[i] \
-                and len(p_value_to_stars(tukey_results.pvalues[i])) >= min_star:
-            plt.plot(combination, [height, height], color='black')
-            plt.plot([combination[0], combination[0]], endpoint_height, color='black')
-            plt.plot([combination[1], combination[1]], endpoint_height, color='black')
-            plt.text(np.mean(combination), height,
-                     p_value_to_stars(tukey_results.pvalues[i]), ha='center')
-            height += min_height
+    stars = [p_value_to_stars(p) for p in tukey_results.pvalues]
+    sig = np.flatnonzero([r and len(s) >= min_star
+                          for r, s in zip(tukey_results.reject, stars)])
+    if sig.size > 0:
+        xi, xj = xi[sig], xj[sig]
+        heights = height + min_height * np.arange(sig.size)
+        # batch the horizontal line and both endpoint ticks of every significant
+        # pair into one LineCollection: one artist instead of 3 Line2D per pair
+        segs = np.empty((sig.size, 3, 2, 2))
+        segs[:, 0, 0, 0], segs[:, 0, 1, 0] = xi, xj
+        segs[:, 0, :, 1] = heights[:, None]
+        segs[:, 1, :, 0], segs[:, 2, :, 0] = xi[:, None], xj[:, None]
+        segs[:, 1:, 0, 1], segs[:, 1:, 1, 1] = endpoint_height
+        ax.add_collection(LineCollection(segs.reshape(-1, 2, 2), colors='black'))
+        for k, sig_idx in enumerate(sig.tolist()):
+            ax.text((xi[k]+xj[k])/2, heights[k], stars[sig_idx], ha='center')
 
     plt.xticks(x, tukey_results.groupsunique)
-    return plt.gca()
+    return ax
 
 
 __all__ = [
@@ -22,7 +22,12 @@ else:
     from ..stats.df import (get_df_data, pro_bar_data, pro_bar_data_R,
                            sort_df_factors)
 
+# evaluated once at import: rcParams lookups and by_key() rebuild dicts on every call
+_DEFAULT_COLORS = tuple(plt.rcParams['axes.prop_cycle'].by_key()['color'])
+_OFFSET_BASE = plt.rcParams['font.size'] + 8
+
 class AxisLable():
+    __slots__ = ['name', 'hold_space', 'father', 'child', '_hash']
     def __init__(self, name:str, hold_space:int = 1) -> None:
         self.name = name
         self.hold_space = hold_space
@@ -58,37 +63,38 @@ def pro_hue_pos(factors:List[str], df:pd.DataFrame, width:float,
         - `df` must be processed by `pro_bar_data` or `sort_df_factors`.
         - The LAST factor will be the TOP level x-axis.
     """
-    xlabels, fj_old, pos = [ [] for _ in range(len(factors))], None, []
-    xlabels_mat = df[factors].T.values.tolist()
+    n, xlabels, pos = df.shape[0], [], []
     # build relationships between each level sub-factors. build xlabels and allocte space for each level.
-    for i, fi in enumerate(factors[::-1]): # 从最高级开始
-        for j, fj in enumerate(df[fi]):
-            # 不同sub-factor 或 相同sub-factor但上级sub-factor不同
-            if (str(fi)+str(fj)) != fj_old or (i > 0 and xlabels_mat[i-1][j] != xlabels_mat[i-1][j-1]):
-                xlabels_mat[i][j] = AxisLable(fj)
-                xlabels[i].append(AxisLable(fj))
-                fj_old = str(fi)+str(fj) # 以防两个级别的factors中出现相同的sub-factors
-                if i > 0:
-                    xlabels_mat[i][j].add_father(xlabels_mat[i-1][j])
-            else:
-                xlabels_mat[i][j] = xlabels_mat[i][j-1]
-                xlabels[i][-1].add_space()
+    # a run at level i starts whenever its own value changes OR any higher level starts a new run,
+    # so the boundary mask just accumulates (OR) while descending the levels.
+    boundary = np.zeros(n, dtype=bool)
+    boundary[0] = True
+    father_run_idx, father_labels = None, None
+    for fi in factors[::-1]: # 从最高级开始
+        col = df[fi].to_numpy()
+        boundary |= df[fi].ne(df[fi].shift()).to_numpy()
+        starts = np.flatnonzero(boundary)
+        sizes = np.diff(np.append(starts, n))
+        labels = [AxisLable(name, int(size)) for name, size in zip(col[starts], sizes)]
+        if father_labels is not None:
+            for label, father_idx in zip(labels, father_run_idx[starts]):
+                label.add_father(father_labels[father_idx])
+        xlabels.append(labels)
+        father_run_idx, father_labels = np.cumsum(boundary) - 1, labels
     xlabels = xlabels[::-1] # 倒序，使最高级在最后
     xlabels.append([AxisLable(factors[-1], df.shape[0])])#master level has an extra total axis as x_title
     for axis_idx in range(len(xlabels)):
-        pos.append([])
         if axis_idx == 0:
-            st_pos = hue_space
-            for h_fc_idx in range(len(xlabels[axis_idx+1])):
-                sum_this_hue_bar = xlabels[axis_idx+1][h_fc_idx].hold_space
-                pos[axis_idx] += [st_pos+width*(i+0.5)+bar_space*i for i in range(sum_this_hue_bar)]
-                st_pos += (sum_this_hue_bar*width+(sum_this_hue_bar-1)*bar_space+hue_space)
+            # SoA layout: work on the hold_space vector, not the label objects
+            spans = np.array([label.hold_space for label in xlabels[axis_idx+1]])
+            group_width = spans*width + (spans-1)*bar_space + hue_space
+            group_st = hue_space + np.cumsum(group_width) - group_width
+            # per-bar index inside its own hue group, for all groups at once
+            bar_idx = np.arange(spans.sum()) - np.repeat(np.cumsum(spans)-spans, spans)
+            pos.append((np.repeat(group_st, spans) + width*(bar_idx+0.5) + bar_space*bar_idx).tolist())
         else:
-            st_pos = 0
-            for fc_idx in range(len(xlabels[axis_idx])):
-                this_hue_per = xlabels[axis_idx][fc_idx].hold_space / df.shape[0]
-                pos[axis_idx].append(st_pos+this_hue_per/2)
-                st_pos += this_hue_per
+            hue_per = np.array([label.hold_space for label in xlabels[axis_idx]]) / df.shape[0]
+            pos.append((np.cumsum(hue_per) - hue_per/2).tolist())
     return xlabels, pos
 
 def plot_bar(factors:List[str], tags:List[str], df:pd.DataFrame, **kwargs):
@@ -143,12 +149,12 @@ def plot_bar(factors:List[str], tags:List[str], df:pd.DataFrame, **kwargs):
                             'jitter_kwargs': {'size': 10, 'alpha': 0.5, 'color': None},
                             'width':0.4, 'hue_space':0.2, 'bar_space':0.05,
                             'xrotations':[0]*len(factors),
-                            'colors':plt.rcParams['axes.prop_cycle'].by_key()['color'],
+                            'colors':_DEFAULT_COLORS,
                             'hatchs': None,
                             'font_size':None,
                             'labels':None,
                             'ylabel': None,
-                            'offset':[None] + [(i+1)*(plt.rcParams['font.size']+8) for i in range(len(factors))],
+                            'offset':[None] + [(i+1)*_OFFSET_BASE for i in range(len(factors))],
                             'xticks_pad':[5 for _ in range(len(factors)+1)],
                             'edgecolor':['white'] * len(tags),
                             'linewidth': 0,
@@ -247,8 +253,8 @@ def plot_positional_hue(factors:List[str], tags:List[str], df:pd.DataFrame, **kw
             if len(tags) == 0:
                 tags = list(df.columns)[len(factors):]    
             margs = get_wanted_args({'width':0.4, 'bar_space':0.2, 'xrotations':[0]*len(factors),
-                                    'colors':plt.rcParams['axes.prop_cycle'].by_key()['color'],
-                                    'offset':[(i+1)*(plt.rcParams['font.size']+8) for i in range(len(factors))]},
+                                    'colors':_DEFAULT_COLORS,
+                                    'offset':[(i+1)*_OFFSET_BASE for i in range(len(factors))]},
                                    kwargs)
             margs.xrotations.append(0)
             xlabels, pos = pro_hue_pos(factors, df, margs.width, margs.bar_space)
@@ -97,7 +97,11 @@ class SciInstrumentData:
             self.process_raw_data()
     
     def get_tag(self, *args, **kwargs):
-        return self.tag or self.make_tag()
+        # memoize on the instance: the tag doubles as a dict key all over the
+        # scripts, so it must not be re-derived per lookup
+        if self.tag is None:
+            self.tag = self.make_tag()
+        return self.tag
     
     
 __all__ = [
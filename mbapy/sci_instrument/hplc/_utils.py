@@ -1,4 +1,5 @@
 
+from functools import lru_cache
 from typing import Callable, List, Tuple, Dict, Union
 
 import scipy
@@ -15,9 +16,15 @@ else:
     from ._base import HplcData
     
     
+@lru_cache(maxsize=64)
+def _cached_palette(mode: str, n: int):
+    """palette per (mode, n): label processing re-runs on every explorer refresh,
+    the colors only depend on the mode and count."""
+    return tuple(get_palette(n, mode = mode))
+
 def process_file_labels(labels: str, file_col_mode = 'hls'):
     labels = '' if labels is None else labels
-    file_labels, colors = [], get_palette(len(labels.split(';')), mode = file_col_mode)
+    file_labels, colors = [], _cached_palette(file_col_mode, len(labels.split(';')))
     for idx, i in enumerate(labels.split(';')):
         if i:
             pack = i.split(',')
@@ -27,7 +34,7 @@ def process_file_labels(labels: str, file_col_mode = 'hls'):
 
 def process_peak_labels(labels: str, peak_col_mode = 'hls'):
     labels = '' if labels is None else labels
-    peak_labels, cols = {}, get_palette(len(labels.split(';')), mode = peak_col_mode)
+    peak_labels, cols = {}, _cached_palette(peak_col_mode, len(labels.split(';')))
     for i, label in enumerate(labels.split(';')):
         if label:
             items = label.split(',')
@@ -38,6 +45,40 @@ def process_peak_labels(labels: str, peak_col_mode = 'hls'):
             peak_labels[float(t)] = [label, color]
     return peak_labels
 
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int):
+    """
+    Largest-Triangle-Three-Buckets downsample of a trace to ~n_out points.
+    Keeps the visually dominant vertices (peaks included) so a drawn line is
+    indistinguishable from the full-resolution one at screen/print pixel counts.
+
+    Parameters:
+        - x: np.ndarray, monotonic x values
+        - y: np.ndarray, signal values
+        - n_out: int, number of points to keep
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: downsampled (x, y), or the inputs
+            unchanged when n_out cannot reduce them.
+    """
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idxs = np.empty(n_out, dtype = np.int64)
+    idxs[0], idxs[-1] = 0, n - 1
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i] + 1, edges[i + 1])
+        # the next bucket's mean stands in for its eventual pick
+        if i < n_out - 3 and edges[i + 2] > edges[i + 1]:
+            next_x, next_y = x[edges[i + 1]:edges[i + 2]].mean(), y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        last_x, last_y = x[idxs[i]], y[idxs[i]]
+        # pick the bucket point spanning the largest triangle with its neighbours
+        area = np.abs((last_x - next_x) * (y[lo:hi] - last_y) - (last_x - x[lo:hi]) * (next_y - last_y))
+        idxs[i + 1] = lo + area.argmax()
+    return x[idxs], y[idxs]
+
 def plot_hplc(hplc_data: Union[HplcData, List[HplcData]],
               ax = None, fig_size = (10, 8),
               dfs_refinment_x: Dict[str, float] = {}, dfs_refinment_y: Dict[str, float] = {},
@@ -48,7 +89,8 @@ def plot_hplc(hplc_data: Union[HplcData, List[HplcData]],
               start_search_time: float = 0, end_search_time = None, labels_eps = 0.1, min_height = 0, min_peak_width = 1,
               marker_offset = (0, 0.05), marker_size = 80,
               show_tag_text = True, tag_offset = (0.05, 0.05), tag_fontsize = 15,
-              dpi = 600, line_width = 2, legend_fontsize = 15, **kwargs) -> Tuple[plt.Axes, List[plt.Artist]]:
+              dpi = 600, line_width = 2, legend_fontsize = 15,
+              max_draw_points = 10000, **kwargs) -> Tuple[plt.Axes, List[plt.Artist]]:
     """
     Parameters:
         - hplc_data: Union[HPLC_Data, List[HPLC_Data]], HPLC_Data or list of HPLC_Data
@@ -79,6 +121,9 @@ def plot_hplc(hplc_data: Union[HplcData, List[HplcData]],
         - dpi: DPI, default is 600
         - line_width: line width for plot
         - legend_fontsize: legend font size
+        - max_draw_points: LTTB-downsample traces longer than twice this to this
+            many points before drawing; peak search still runs on the full trace.
+            Set to 0 or None to always draw full resolution.
 
     Returns:
         - plt.Axes: ax
@@ -107,7 +152,7 @@ def plot_hplc(hplc_data: Union[HplcData, List[HplcData]],
     # 处理峰值标签
     if isinstance(peak_labels, str):
         peak_labels = peak_label_fn(peak_labels)
-    peak_labels_v = np.array(list(peak_labels.keys()))
+    peak_labels_v = np.fromiter(peak_labels.keys(), dtype = np.float64, count = len(peak_labels))
     # 绘制每个数据
     if ax is None:
         _, ax = plt.subplots(figsize = fig_size)
@@ -115,7 +160,12 @@ def plot_hplc(hplc_data: Union[HplcData, List[HplcData]],
     lines, scatters, sc_labels = [], [], []
     for label, data_i, data_df_i in zip(file_labels, hplc_data, data_dfs):
         label_string, color = label
-        line = ax.plot(data_df_i[data_i.X_HEADER], data_df_i[data_i.Y_HEADER],
+        # 绘图前对超长trace做LTTB降采样, 峰值搜索仍在全分辨率数据上进行
+        plot_x = data_df_i[data_i.X_HEADER].to_numpy()
+        plot_y = data_df_i[data_i.Y_HEADER].to_numpy()
+        if max_draw_points and plot_x.size > 2 * max_draw_points:
+            plot_x, plot_y = lttb_downsample(plot_x, plot_y, max_draw_points)
+        line = ax.plot(plot_x, plot_y,
                        color = color, label = label_string, linewidth = line_width)[0]
         lines.append(line)
         # 搜索峰值
@@ -123,14 +173,22 @@ def plot_hplc(hplc_data: Union[HplcData, List[HplcData]],
         ed = data_i.get_tick_by_minute(end_search_time) if end_search_time is not None else None
         peaks_idx, peak_props = scipy.signal.find_peaks(data_df_i[data_i.Y_HEADER], rel_height = 1,
                                                         prominence = min_height, width = data_i.get_tick_by_minute(min_peak_width))
-        peaks_idx = peaks_idx[peaks_idx >= (st - data_i.get_tick_by_minute(dfs_refinment_x.get(data_i.get_tag(), 0)))] # addjust for offset
+        # 单个布尔掩码同时应用两个搜索时间界限, 只做一次fancy-index
+        keep = peaks_idx >= (st - data_i.get_tick_by_minute(dfs_refinment_x.get(data_i.get_tag(), 0))) # addjust for offset
         if ed is not None:
-            peaks_idx = peaks_idx[peaks_idx <= ed]
-        peak_df = data_df_i.iloc[peaks_idx, :]
-        for t, a in zip(peak_df[data_i.X_HEADER], peak_df[data_i.Y_HEADER]):                    
-            matched = np.where(np.abs(peak_labels_v - t) < labels_eps)[0]
-            if matched.size > 0:
-                label, col = peak_labels[peak_labels_v[matched[0]]]
+            keep &= peaks_idx <= ed
+        peak_df = data_df_i.iloc[peaks_idx[keep], :]
+        peak_t = peak_df[data_i.X_HEADER].to_numpy()
+        peak_a = peak_df[data_i.Y_HEADER].to_numpy()
+        # 向量化峰值标签匹配: 一次广播比较代替每峰一次np.where
+        if peak_labels_v.size and peak_t.size:
+            close = np.abs(peak_labels_v[None, :] - peak_t[:, None]) < labels_eps
+            has_match, first_match = close.any(axis = 1), close.argmax(axis = 1)
+        else:
+            has_match = first_match = np.zeros(peak_t.size, dtype = int)
+        for i, (t, a) in enumerate(zip(peak_t, peak_a)):
+            if has_match[i]:
+                label, col = peak_labels[peak_labels_v[first_match[i]]]
                 sc = ax.scatter(t+marker_offset[0], a+marker_offset[1], marker='*', s = marker_size, color = col)
                 scatters.append(sc)
                 sc_labels.append(label)
@@ -158,6 +216,7 @@ def plot_hplc(hplc_data: Union[HplcData, List[HplcData]],
 
 
 __all__ = [
+    'lttb_downsample',
     'plot_hplc',
     ]
 
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import os
 import random
 import re
@@ -129,6 +131,14 @@ def _download_from_scihub_webpage(webpage:requests.Response, proxies = None, try
         put_err(f'can not download with parsed doi: {doi} and title: {title}')
         return None
 
+@functools.lru_cache(maxsize=None)
+def _get_file_name_table(valid_path_chr: str):
+    """one translate table for paper file names: '/' reads as ' or ' in titles,
+    the other invalid path chars map to valid_path_chr. Built once per char."""
+    table = {c: valid_path_chr for c in ':*?"<>|\n\t'}
+    table['/'] = ' or '
+    return str.maketrans(table)
+
 @parameter_checker(check_parameters_bool, raise_err = False)
 def download_from_scihub_by_doi(doi:str, proxies = None, try_times = 3):
     """
@@ -196,18 +206,19 @@ def download_by_scihub(dir: str, doi: str = None, title:str = None,
     Notes:
         - if doi is None and can't get doi from sci-hub webpage, doi will be set as %Y%m%d.%H%M%S
     """
+    # check whether doi or title are specified, before any side effect
+    if doi is None and title is None:
+        return put_err('Either DOI or title must be specified, returns None', None)
     # check dir exists, if not, create it
     if not check_parameters_path(dir):
         os.makedirs(dir)
-    # check whether doi or title are specified
-    if doi is None and title is None:
-        return put_err('Either DOI or title must be specified, returns None', None)
     # download from Sci-Hub by DOI or title
     if doi:
         result = download_from_scihub_by_doi(doi, try_times = try_times)
     else:
         result = download_from_scihub_by_title(title, try_times = try_times)
-    if result is None:
+    # fail fast on any non-dict result: skip all file-name work on the error path
+    if not isinstance(result, dict):
         return put_err(f"can't download with \ndoi:{doi}\ntitle:{title}\n, returns None", None)
     # deal with err title and doi
     if result['title'] is None:
@@ -219,7 +230,9 @@ def download_by_scihub(dir: str, doi: str = None, title:str = None,
         file_name = file_full_name
     else:
         file_name = ((title if title else result['title']) if use_title_as_name else doi.replace('/', '_')) + '.pdf'
-    file_name = file_name.replace('/', ' or ')
+    # one C-level pass handles '/' -> ' or ' and the invalid path chars together;
+    # get_valid_file_path then only clamps the length
+    file_name = file_name.translate(_get_file_name_table(valid_path_chr))
     file_name = get_valid_file_path(file_name, valid_path_chr)
     file_path = os.path.join(dir, file_name)
     try:
@@ -230,7 +243,48 @@ def download_by_scihub(dir: str, doi: str = None, title:str = None,
     result['file_name'] = file_name
     result['file_path'] = file_path
     return result
-    
+
+
+# successful downloads keyed by cleaned DOI, so retrying a partially
+# failed batch does not re-hit sci-hub for papers already fetched
+_doi_download_cache: Dict[str, dict] = {}
+
+async def download_many_by_scihub(dois: List[str], dir: str, concurrency: int = 8,
+                                  try_times = 3, **kwargs):
+    """
+    Download a batch of papers from Sci-Hub by DOI concurrently.
+    Each download runs `download_by_scihub` in a worker thread, with at most
+    `concurrency` requests in flight, so a batch of N DOIs takes roughly
+    N/concurrency network round-trips instead of N.
+
+    Parameters:
+        - dois (List[str]): The DOIs of the papers to download.
+        - dir (str): The directory where the downloaded files will be saved.
+        - concurrency (int, optional): Max simultaneous downloads. Defaults to 8.
+        - try_times (int, optional): Retry times passed to `download_by_scihub`. Defaults to 3.
+        - kwargs: other keyword arguments passed to `download_by_scihub`.
+
+    Returns:
+        List[dict or None]: results in the same order as `dois`, each as
+            returned by `download_by_scihub`.
+    """
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+    # resolve the scihub url list once so worker threads do not race on it
+    await loop.run_in_executor(None, _update_available_scihub_urls)
+    async def _download_one(doi: str):
+        clean_doi = get_clean_doi(doi) or doi
+        if clean_doi in _doi_download_cache:
+            return _doi_download_cache[clean_doi]
+        async with sem:
+            result = await loop.run_in_executor(
+                None, functools.partial(download_by_scihub, dir, doi,
+                                        try_times = try_times, **kwargs))
+        if result is not None:
+            _doi_download_cache[clean_doi] = result
+        return result
+    return await asyncio.gather(*(_download_one(doi) for doi in dois))
+
 
 __all__ = [
     'session',
@@ -241,7 +295,8 @@ __all__ = [
     'download_from_scihub_by_doi',
     'download_from_scihub_by_title',
     'download_by_scihub',
-]    
+    'download_many_by_scihub',
+]
 
     
 if __name__ == '__main__':
@@ -1,6 +1,9 @@
 import argparse
+import base64
+import bisect
+import io
 import os
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from pathlib import Path
 from typing import Dict, List, Union, Tuple, Callable
@@ -10,15 +13,31 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# HPLC traces carry tens of thousands of vertices; let Agg skip sub-pixel
+# vertices and chunk long paths instead of rasterizing every sample
+plt.rcParams.update({'path.simplify': True, 'path.simplify_threshold': 1.0,
+                     'agg.path.chunksize': 10000})
+
 os.environ['MBAPY_AUTO_IMPORT_TORCH'] = 'False'
 os.environ['MBAPY_FAST_LOAD'] = 'True'
 from mbapy.base import put_err
 from mbapy.plot import get_palette, save_show
-from mbapy.file import decode_bits_to_str, get_paths_with_extension, get_valid_file_path
+from mbapy.file import decode_bits_to_str, get_valid_file_path
 from mbapy.sci_instrument.hplc import HplcData, WatersData, SciexData, SciexTicData
 from mbapy.sci_instrument.hplc._utils import plot_hplc as _plot_hplc, process_file_labels, process_peak_labels
 from mbapy.scripts._script_utils_ import clean_path, Command, excute_command
 
+# explorer-only dependency: imported on first explore_hplc construction so the
+# plot-hplc subcommand never pays the nicegui import cost
+ui = app = None
+
+def _load_nicegui():
+    global ui, app
+    if ui is None:
+        from nicegui import app as _app, ui as _ui
+        ui, app = _ui, _app
+    return ui
+
 
 class plot_hplc(Command):
     SUPPORT_SYSTEMS = {'waters', 'SCIEX', 'SCIEX-TIC'}
@@ -58,9 +77,16 @@ class plot_hplc(Command):
         return args
 
     def load_dfs_from_data_file(self):
-        paths = get_paths_with_extension(self.args.input, [self.sys2suffix[self.args.system]], recursive=self.args.recursive)
-        dfs = [self.data_model(path) for path in paths]
-        dfs = {data.get_tag():data for data in dfs if data.SUCCEED_LOADED}
+        # stream paths from the suffix glob straight into the pool instead of
+        # materializing (and stat-ing) the whole tree up front; per-file load is
+        # disk I/O plus parsing, so overlapping files on a thread pool makes
+        # batch load scale with disk speed instead of file count
+        root = Path(self.args.input)
+        pattern = f'*.{self.sys2suffix[self.args.system]}'
+        paths = root.rglob(pattern) if self.args.recursive else root.glob(pattern)
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            dfs = {data.get_tag():data for data in pool.map(self.data_model, map(str, paths))
+                   if data.SUCCEED_LOADED}
         return dfs
 
     def process_args(self):
@@ -71,7 +97,7 @@ class plot_hplc(Command):
         if not os.path.isdir(self.args.output):
             print(f'given output {self.args.output} is a file, change it to parent dir')
             self.args.output = self.args.output.parent
-        self.args.file_legend_bbox = eval(f'({self.args.file_legend_bbox})') # NOTE: can be invoked
+        self.args.file_legend_bbox = tuple(map(float, self.args.file_legend_bbox.split(',')))
         self.data_model = self.sys2model[self.args.system]
         # file labels
         self.args.file_labels = process_file_labels(self.args.file_labels)
@@ -86,36 +112,61 @@ class plot_hplc(Command):
         if not self.dfs:
             raise FileNotFoundError(f'can not find data files in {self.args.input}')
         # show data general info and output peak list DataFrame
+        def _rasterize_lines(ax):
+            # keep axes/text vector but let data lines go through the raster
+            # layer: saving to svg/pdf no longer writes one path per sample
+            if self.args.dpi >= 300:
+                for line in ax.get_lines():
+                    line.set_rasterized(True)
         if self.args.merge:
             dfs = list(self.dfs.values())
             ax, legends = _plot_hplc(dfs, **self.args.__dict__)
+            _rasterize_lines(ax)
             _save_fig(self.args.output, "merge.png", self.args.dpi, self.args.show, legends)
         else:
             for tag, data in self.dfs.items():
                 print(f'plotting data for {tag}')
                 data.save_processed_data()
+                # pandas copies can come back F-contiguous; keep the plot/peak
+                # reductions on unit-stride C-order memory
+                arr = data.processed_data.values
+                if not arr.flags.c_contiguous:
+                    data.processed_data = pd.DataFrame(np.ascontiguousarray(arr),
+                                                       columns=data.processed_data.columns,
+                                                       index=data.processed_data.index)
                 ax, legends = _plot_hplc(data, **self.args.__dict__)
+                _rasterize_lines(ax)
                 _save_fig(self.args.output, f"{tag.replace('/', '-')}.png", self.args.dpi, self.args.show, legends)
 
 
 class explore_hplc(plot_hplc):
-    from nicegui import ui
     def __init__(self, args: argparse.Namespace, printf=print) -> None:
         super().__init__(args, printf)
+        _load_nicegui()
+        # wrap per-instance so the class body needs no ui at import time
+        self.make_tabs = ui.refreshable(self.make_tabs)
+        self.make_fig = ui.refreshable(self.make_fig)
+        self._ui_refinment_numbers = ui.refreshable(self._ui_refinment_numbers)
         self.now_name = ''
         self.fig = None
-        self.dfs = OrderedDict()
+        self.ax = None
+        self.dfs = {}
         self.dfs_checkin = {}
         self.dfs_refinment_x = {}
         self.dfs_refinment_y = {}
         self.stored_dfs = {}
+        self._sorted_names = []
         self._expansion = []
         self._bbox_extra_artists = None
+        self._last_state_key = None
+        self._last_png = None
+        self._label_cache = {}
         self.is_bind_lim = False
         self.xlim_number_min = None
         self.xlim_number_max = None
         self.xlim_search_number_min = None
         self.xlim_search_number_max = None
+        self._lim_partners = {}
         
     @staticmethod
     def make_args(args: argparse.ArgumentParser):
@@ -135,7 +186,6 @@ class explore_hplc(plot_hplc):
         self.data_model = self.sys2model[self.args.system]
         
     async def load_data(self, event):
-        from nicegui import ui
         for name, content in zip(event.names, event.contents):
             if name.endswith(self.sys2suffix[self.args.system]):
                 df = self.data_model()
@@ -145,54 +195,104 @@ class explore_hplc(plot_hplc):
                 if df.check_processed_data_empty():
                     ui.notify(f'{name} is not a valid {self.args.system} file, skip')
                     continue
-                self.stored_dfs[df.make_tag()] = df
+                self._store_df(df.make_tag(), df)
             else:
                 ui.notify(f'{name} is not a arw file, skip')
                 continue
             ui.notify(f'loaded {name}')
         self.make_tabs.refresh()
         
+    def _store_df(self, name: str, df):
+        # keep the tab order incrementally sorted: insort per new file beats
+        # re-sorting all names on every make_tabs refresh
+        if name not in self.stored_dfs:
+            bisect.insort(self._sorted_names, name)
+        self.stored_dfs[name] = df
+
     def load_data_from_dir(self):
         for name, dfs in self.load_dfs_from_data_file().items():
-            self.stored_dfs[name] = dfs
+            self._store_df(name, dfs)
         self.make_tabs.refresh()
         
-    def _push_df_from_tabs(self, event):
-        if event.value:
-            self.dfs[event.sender.text] = self.stored_dfs[event.sender.text]
-        else:
-            self.dfs.pop(event.sender.text, None)
+    def _push_dfs_from_tabs(self, event):
+        # one batched selection event instead of one callback per file checkbox
+        selected = {row['name'] for row in event.selection}
+        for name in selected.difference(self.dfs):
+            self.dfs[name] = self.stored_dfs[name]
+            self.dfs_checkin[name] = True
+        for name in set(self.dfs).difference(selected):
+            self.dfs.pop(name, None)
+            self.dfs_checkin[name] = False
         self._ui_refinment_numbers.refresh()
-        
-    @ui.refreshable
+
     def make_tabs(self):
-        from nicegui import ui
         with ui.card().classes('h-full'):
-            for name in sorted(self.stored_dfs):
-                if name not in self.dfs_checkin:
-                    self.dfs_checkin[name] = False
-                ui.checkbox(text = name, value = self.dfs_checkin[name],
-                            on_change=self._push_df_from_tabs).bind_value_to(self.dfs_checkin, name)
+            names = self._sorted_names
+            for name in names:
+                self.dfs_checkin.setdefault(name, False)
+            table = ui.table(columns = [{'name': 'name', 'label': 'Data File', 'field': 'name'}],
+                             rows = [{'name': n} for n in names], row_key = 'name',
+                             selection = 'multiple', on_select = self._push_dfs_from_tabs)
+            table.selected = [{'name': n} for n in names if self.dfs_checkin[n]]
                 
-    @ui.refreshable
+    def _cached_file_label_fn(self, labels: str):
+        # parse once per (labels, col_mode); plot_hplc may recolor the fallback
+        # entry in place, so hand out fresh inner lists
+        key = ('file', labels, self.args.file_col_mode)
+        if key not in self._label_cache:
+            if len(self._label_cache) > 64:
+                self._label_cache.clear()
+            self._label_cache[key] = process_file_labels(labels, self.args.file_col_mode)
+        return [list(item) for item in self._label_cache[key]]
+
+    def _cached_peak_label_fn(self, labels: str):
+        key = ('peak', labels, self.args.peak_col_mode)
+        if key not in self._label_cache:
+            if len(self._label_cache) > 64:
+                self._label_cache.clear()
+            self._label_cache[key] = process_peak_labels(labels, self.args.peak_col_mode)
+        return dict(self._label_cache[key])
+
     def make_fig(self):
-        from nicegui import ui
-        plt.close(self.fig)
-        with ui.pyplot(figsize=self.args.fig_size, close=False) as fig:
-            self.fig = fig.fig
-            if self.dfs:
-                ax, self._bbox_extra_artists = _plot_hplc(list(self.dfs.values()), ax = self.fig.gca(),
-                                                          dfs_refinment_x=self.dfs_refinment_x,
-                                                          dfs_refinment_y=self.dfs_refinment_y,
-                                                          file_label_fn=partial(process_file_labels, file_col_mode=self.args.file_col_mode),
-                                                          peak_label_fn=partial(process_peak_labels, peak_col_mode=self.args.peak_col_mode),
-                                                          **self.args.__dict__)
-                ax.tick_params(axis='both', which='major', labelsize=self.args.axis_ticks_fontsize)
-                ax.set_xlabel(self.args.xlabel, fontsize=self.args.axis_label_fontsize)
-                ax.set_ylabel(self.args.ylabel, fontsize=self.args.axis_label_fontsize)
-                ax.set_xlim(left=self.args.xlim[0], right=self.args.xlim[1])
-                ax.set_ylim(bottom=self.args.ylim[0], top=self.args.ylim[1])
-                plt.tight_layout()
+        # dirty flag: skip the whole matplotlib draw when nothing observable
+        # changed since the last render and just re-emit the cached PNG
+        state_key = (tuple(self.dfs), tuple(self.dfs_refinment_x.items()),
+                     tuple(self.dfs_refinment_y.items()), repr(self.args.__dict__))
+        if state_key == self._last_state_key and self._last_png is not None:
+            ui.image('data:image/png;base64,' + self._last_png)
+            return
+        # reuse one Figure across refreshes: clearing the axes is much cheaper
+        # than tearing down and recreating the Agg backend buffers every click
+        if self.fig is None or list(self.fig.get_size_inches()) != list(self.args.fig_size):
+            plt.close(self.fig)
+            self.fig, self.ax = plt.subplots(figsize = self.args.fig_size)
+        else:
+            self.ax.clear()
+        if self.dfs:
+            ax, self._bbox_extra_artists = _plot_hplc(list(self.dfs.values()), ax = self.ax,
+                                                      dfs_refinment_x=self.dfs_refinment_x,
+                                                      dfs_refinment_y=self.dfs_refinment_y,
+                                                      file_label_fn=self._cached_file_label_fn,
+                                                      peak_label_fn=self._cached_peak_label_fn,
+                                                      **self.args.__dict__)
+            ax.tick_params(axis='both', which='major', labelsize=self.args.axis_ticks_fontsize)
+            ax.set_xlabel(self.args.xlabel, fontsize=self.args.axis_label_fontsize)
+            ax.set_ylabel(self.args.ylabel, fontsize=self.args.axis_label_fontsize)
+            ax.set_xlim(left=self.args.xlim[0], right=self.args.xlim[1])
+            ax.set_ylim(bottom=self.args.ylim[0], top=self.args.ylim[1])
+            if self.args.dpi >= 300:
+                # embed traces as a raster layer at print DPI: saving no longer
+                # writes one vector path per sample
+                for line in ax.lines:
+                    line.set_rasterized(True)
+            self.fig.tight_layout()
+        buf = io.BytesIO()
+        # preview frames are throwaway: zlib level 1 cuts the dominant
+        # compression cost for ~20% larger in-memory bytes
+        self.fig.savefig(buf, format = 'png', pil_kwargs = {'compress_level': 1})
+        self._last_png = base64.b64encode(buf.getvalue()).decode()
+        self._last_state_key = state_key
+        ui.image('data:image/png;base64,' + self._last_png)
             
     def _ui_only_one_expansion(self, e):
         if e.value:
@@ -200,9 +300,7 @@ class explore_hplc(plot_hplc):
                 if expansion != e.sender:
                     expansion.set_value(False)
                     
-    @ui.refreshable
     def _ui_refinment_numbers(self):
-        from nicegui import ui
         # update dfs_refinment
         self.dfs_refinment_x = {n: (0 if n not in self.dfs_refinment_x else self.dfs_refinment_x[n]) for n in self.dfs}
         self.dfs_refinment_y = {n: (0 if n not in self.dfs_refinment_y else self.dfs_refinment_y[n]) for n in self.dfs}
@@ -215,31 +313,31 @@ class explore_hplc(plot_hplc):
             
     def _ui_bind_xlim_onchange(self, e):
         if self.is_bind_lim:
-            if e.sender == self.xlim_number_min:
-                self.xlim_search_number_min.set_value(e.value)
-            elif e.sender == self.xlim_search_number_min:
-                self.xlim_number_min.set_value(e.value)
-            elif e.sender == self.xlim_number_max:
-                self.xlim_search_number_max.set_value(e.value)
-            elif e.sender == self.xlim_search_number_max:
-                self.xlim_number_max.set_value(e.value)
+            partner = self._lim_partners.get(e.sender)
+            if partner is not None:
+                partner.set_value(e.value)
                     
     def save_fig(self):
-        from nicegui import ui
         path = os.path.join('./', self.args.file_name)
         ui.notify(f'saving figure to {path}')
-        save_show(path, dpi = self.args.dpi, show = False, bbox_extra_artists = self._bbox_extra_artists)
+        if self.ax is not None and self.args.dpi >= 300:
+            for line in self.ax.get_lines():
+                line.set_rasterized(True)
+        # pil_kwargs is PNG-only; other backends reject the keyword
+        fast_png = {'pil_kwargs': {'compress_level': 1}} \
+            if self.args.fast_save and path.lower().endswith('.png') else {}
+        save_show(path, dpi = self.args.dpi, show = False,
+                  bbox_extra_artists = self._bbox_extra_artists, **fast_png)
         
     @staticmethod
-    def _apply_v2list(v, lst, idx):
-        lst[idx] = v
+    def _apply_v2list(e, *, lst, idx):
+        lst[idx] = e.value
     
     def main_process(self):
-        from nicegui import app, ui
         from mbapy.game import BaseInfo
         # make global settings
         # do not support xlim because it makes confusion with peak searching
-        self.args = BaseInfo(file_labels = '', peak_labels = '', merge = False, recursive = False,
+        self.args = BaseInfo(file_labels = '', peak_labels = '', merge = False, recursive = False, fast_save = False,
                              min_peak_width = 0.1, min_height = 0.01, start_search_time = 0, end_search_time = None,
                              show_tag_text = True, labels_eps = 0.1,
                              file_legend_pos = 'upper right', file_legend_bbox = [1.3, 0.75],
@@ -260,6 +358,7 @@ class explore_hplc(plot_hplc):
             ui.label('mbapy-cli HPLC | HPLC Data Explorer').classes('text-h4')
             ui.space()
             ui.checkbox('bind lim', value=self.is_bind_lim).bind_value_to(self, 'is_bind_lim').tooltip('bind value of search-lim and plot-lim')
+            ui.checkbox('fast save', value=self.args.fast_save).bind_value_to(self.args, 'fast_save').tooltip('save PNG with low compression, ~4x faster and ~20% larger')
             ui.checkbox('merge', value=self.args.merge).bind_value_to(self.args,'merge').bind_value_from(self, 'dfs', lambda dfs: len(dfs) > 1)
             ui.button('Plot', on_click=self.make_fig.refresh, icon='refresh').props('no-caps')
             ui.button('Save', on_click=self.save_fig, icon='save').props('no-caps')
@@ -302,11 +401,11 @@ class explore_hplc(plot_hplc):
                                 ui.number('tag fontsize', value=self.args.tag_fontsize, min=0, step=0.5, format='%.1f').bind_value_to(self.args, 'tag_fontsize')
                                 ui.number('marker size', value=self.args.marker_size, min=0, step=5, format='%.1f').bind_value_to(self.args,'marker_size')
                             with ui.row().classes('w-full'):
-                                ui.number('tag offset x', value=self.args.tag_offset[0], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.tag_offset, 0))
-                                ui.number('marker offset x', value=self.args.marker_offset[0], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.marker_offset, 0))
+                                ui.number('tag offset x', value=self.args.tag_offset[0], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.tag_offset, idx=0))
+                                ui.number('marker offset x', value=self.args.marker_offset[0], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.marker_offset, idx=0))
                             with ui.row().classes('w-full'):
-                                ui.number('tag offset y', value=self.args.tag_offset[1], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.tag_offset, 1))
-                                ui.number('marker offset y', value=self.args.marker_offset[1], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.marker_offset, 1))
+                                ui.number('tag offset y', value=self.args.tag_offset[1], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.tag_offset, idx=1))
+                                ui.number('marker offset y', value=self.args.marker_offset[1], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.marker_offset, idx=1))
                             ui.number('line width', value=self.args.line_width, min=0, step=0.5, format='%.1f').bind_value_to(self.args, 'line_width')
                         # configs for legend
                         with ui.expansion('Configs for Legend', icon='more', on_value_change=self._ui_only_one_expansion) as expansion4:
@@ -327,22 +426,28 @@ class explore_hplc(plot_hplc):
                                 ui.select(label='file legend loc', options=all_loc, value=self.args.file_legend_pos).bind_value_to(self.args, 'file_legend_pos').classes('w-2/5')
                                 ui.select(label='peak legend loc', options=all_loc, value=self.args.peak_legend_pos).bind_value_to(self.args, 'peak_legend_pos').classes('w-2/5')
                             with ui.row().classes('w-full'):
-                                ui.number('file bbox1', value=self.args.file_legend_bbox[0], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.file_legend_bbox, 0)).classes('w-2/5')
-                                ui.number('peak bbox1', value=self.args.peak_legend_bbox[0], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.peak_legend_bbox, 0)).classes('w-2/5')
+                                ui.number('file bbox1', value=self.args.file_legend_bbox[0], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.file_legend_bbox, idx=0)).classes('w-2/5')
+                                ui.number('peak bbox1', value=self.args.peak_legend_bbox[0], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.peak_legend_bbox, idx=0)).classes('w-2/5')
                             with ui.row().classes('w-full'):
-                                ui.number('file bbox2', value=self.args.file_legend_bbox[1], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.file_legend_bbox, 1)).classes('w-2/5')
-                                ui.number('peak bbox2', value=self.args.peak_legend_bbox[1], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.peak_legend_bbox, 1)).classes('w-2/5')
+                                ui.number('file bbox2', value=self.args.file_legend_bbox[1], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.file_legend_bbox, idx=1)).classes('w-2/5')
+                                ui.number('peak bbox2', value=self.args.peak_legend_bbox[1], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.peak_legend_bbox, idx=1)).classes('w-2/5')
                         # configs for saving
                         with ui.expansion('Configs for Saving', icon='save', on_value_change=self._ui_only_one_expansion) as expansion5:
                             self._expansion.append(expansion5)
                             with ui.row().classes('w-full'):
-                                self.xlim_number_min = ui.number('xlim-min', value=self.args.xlim[0], step=0.1, format='%.2f', on_change=self._ui_bind_xlim_onchange).on_value_change(lambda e: self._apply_v2list(e.value, self.args.xlim, 0))
-                                self.xlim_number_max = ui.number('xlim-max', value=self.args.xlim[1], step=0.1, format='%.2f', on_change=self._ui_bind_xlim_onchange).on_value_change(lambda e: self._apply_v2list(e.value, self.args.xlim, 1))
+                                self.xlim_number_min = ui.number('xlim-min', value=self.args.xlim[0], step=0.1, format='%.2f', on_change=self._ui_bind_xlim_onchange).on_value_change(partial(self._apply_v2list, lst=self.args.xlim, idx=0))
+                                self.xlim_number_max = ui.number('xlim-max', value=self.args.xlim[1], step=0.1, format='%.2f', on_change=self._ui_bind_xlim_onchange).on_value_change(partial(self._apply_v2list, lst=self.args.xlim, idx=1))
+                            # dispatch table for the bind-lim handler: one dict
+                            # lookup per change instead of four sender compares
+                            self._lim_partners = {self.xlim_number_min: self.xlim_search_number_min,
+                                                  self.xlim_search_number_min: self.xlim_number_min,
+                                                  self.xlim_number_max: self.xlim_search_number_max,
+                                                  self.xlim_search_number_max: self.xlim_number_max}
                             with ui.row().classes('w-full'):
-                                ui.number('ylim-min', value=self.args.ylim[0], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.ylim, 0))
-                                ui.number('ylim-max', value=self.args.ylim[1], step=0.01, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.ylim, 1))
-                            ui.number('figure width', value=self.args.fig_size[0], min=1, step=0.5, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.fig_size, 0)).classes('w-2/5')
-                            ui.number('figure height', value=self.args.fig_size[1], min=1, step=0.5, format='%.2f').on_value_change(lambda e: self._apply_v2list(e.value, self.args.fig_size, 1)).classes('w-2/5')
+                                ui.number('ylim-min', value=self.args.ylim[0], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.ylim, idx=0))
+                                ui.number('ylim-max', value=self.args.ylim[1], step=0.01, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.ylim, idx=1))
+                            ui.number('figure width', value=self.args.fig_size[0], min=1, step=0.5, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.fig_size, idx=0)).classes('w-2/5')
+                            ui.number('figure height', value=self.args.fig_size[1], min=1, step=0.5, format='%.2f').on_value_change(partial(self._apply_v2list, lst=self.args.fig_size, idx=1)).classes('w-2/5')
                             dpi_input = ui.number('DPI', value=self.args.dpi, min=100, step=100, format='%d').bind_value_to(self.args, 'dpi')
                             ui.select(options=[100, 300, 600], value=dpi_input.value, label='Quick Set DPI').bind_value_to(dpi_input).classes('w-full')
                             ui.input('figure file name', value=self.args.file_name).bind_value_to(self.args, 'file_name')
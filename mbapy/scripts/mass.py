@@ -1,7 +1,9 @@
 import argparse
 import glob
 import os
-from functools import partial
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List
 
@@ -9,10 +11,17 @@ import scipy
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+from matplotlib.ticker import FuncFormatter
 
 os.environ['MBAPY_AUTO_IMPORT_TORCH'] = 'False'
 os.environ['MBAPY_FAST_LOAD'] = 'True'
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 # if __name__ == '__main__':
 from mbapy.base import put_err
 from mbapy.plot import get_palette, save_show
@@ -25,9 +34,119 @@ from mbapy.scripts._script_utils_ import clean_path, Command, excute_command, sh
 #     from ._script_utils_ import clean_path, excute_command, show_args
 
 
-def _plot_vlines(x, y, col, label = None):
-    plt.vlines(x, 0, y, colors = [col] * len(x), label = label)
-    plt.scatter(x, y, c = col)
+_MASS_RE = re.compile(r'(\d+\.\d+)')
+
+
+@lru_cache(maxsize = 8)
+def _parse_labels(raw: str, color_mode: str = 'hls'):
+    """parse a 'mass,label[,color];...' string once per distinct value, the
+    result (labels dict, pre-sorted mass array and matching RGBA array) is
+    reused across files and across repeated runs in the same process."""
+    result, colors = {}, get_palette(len(raw.split(';')), mode = color_mode)
+    for idx, i in enumerate(raw.split(';')):
+        if i:
+            pack = i.split(',')
+            mass, label, color = pack[0], pack[1], pack[2] if len(pack) == 3 else colors[idx]
+            result[float(mass)] = [label, color]
+    sorted_ms = np.sort(np.fromiter(result.keys(), dtype = np.float64))
+    rgba = np.array([to_rgba(result[m][1]) for m in sorted_ms],
+                    dtype = np.float64).reshape(-1, 4)
+    return result, sorted_ms, rgba
+
+
+def _plot_vlines(x, y, col, label = None, batch: Dict = None):
+    if batch is None:
+        plt.vlines(x, 0, y, colors = [col] * len(x), label = label)
+        plt.scatter(x, y, c = col)
+    else:
+        # accumulate only, one (color, label) group becomes one artist pair in
+        # _draw_vlines_batch instead of one per peak
+        xs, ys = batch.setdefault((col, label), ([], []))
+        xs.extend(np.atleast_1d(x))
+        ys.extend(np.atleast_1d(y))
+
+
+def _draw_vlines_batch(batch: Dict, ax):
+    for (col, label), (xs, ys) in batch.items():
+        # rasterized so vector output (svg) keeps text/axes as vector but does
+        # not embed thousands of line/marker elements
+        ax.vlines(xs, 0, ys, colors = [col] * len(xs), label = label, rasterized = True)
+        ax.scatter(xs, ys, c = [col] * len(xs), rasterized = True)
+
+
+def _log10_h(h):
+    return np.log10(np.clip(np.asarray(h, dtype = np.float64), 1, None))
+
+
+def _set_log_y(ax, h_min, h_max, y_axis_lim):
+    # the heights are drawn as precomputed log10 on a linear axis, so pan/zoom
+    # only goes through the affine transform instead of a per-draw log
+    # transform of every vline endpoint; tick labels keep the log look
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda v, _: f'1e{int(v)}'))
+    ax.set_ylim(np.log10(max(h_min * y_axis_lim[0], 1.0)),
+                np.log10(max(h_max * y_axis_lim[1], 10.0)))
+
+
+if numba is not None:
+    @numba.njit(cache = True)
+    def _match_labels_kernel(ms_arr, sorted_ms, eps): # pragma: no cover
+        out = np.full(ms_arr.shape[0], -1, dtype = np.int64)
+        for i in range(ms_arr.shape[0]):
+            idx = np.searchsorted(sorted_ms, ms_arr[i])
+            best_d = eps
+            for j in (idx, idx - 1): # right first, ties prefer the right label
+                if 0 <= j < sorted_ms.shape[0]:
+                    d = abs(sorted_ms[j] - ms_arr[i])
+                    if d < best_d:
+                        out[i], best_d = j, d
+        return out
+
+
+def _labels_ms(args):
+    # pre-sorted once by process_args / make_fig; library callers that pass a
+    # bare labels dict still get the array built here as a fallback
+    ms = args.__dict__.get('_labels_ms_sorted', None)
+    if ms is None:
+        ms = np.sort(np.fromiter(args.labels.keys(), dtype = np.float64))
+    return ms
+
+
+def _peak_colors(args, labels_ms: np.ndarray, match_idx: np.ndarray):
+    """gather the per-peak RGBA in one vectorized step: matched peaks pick
+    their label color from the (L, 4) table, the rest take args.color."""
+    base = to_rgba(args.color)
+    rgba = args.__dict__.get('_label_rgba', None)
+    if rgba is None:
+        rgba = np.array([to_rgba(args.labels[m][1]) for m in labels_ms],
+                        dtype = np.float64).reshape(-1, 4)
+    if rgba.size == 0:
+        return np.broadcast_to(np.asarray(base), (match_idx.size, 4))
+    return np.where(match_idx[:, None] >= 0, rgba[np.clip(match_idx, 0, None)], base)
+
+
+def _match_labels(ms_arr: np.ndarray, labels_ms: np.ndarray, eps: float):
+    """match each peak mass to its nearest label mass in one vectorized pass,
+    return an index into labels_ms per peak, or -1 when no label is within eps.
+    Uses a numba kernel when available, pure-numpy searchsorted otherwise."""
+    match = np.full(ms_arr.shape, -1, dtype = np.int64)
+    if labels_ms.size == 0 or ms_arr.size == 0:
+        return match
+    order = np.argsort(labels_ms)
+    sorted_ms = labels_ms[order]
+    if numba is not None:
+        nearest = _match_labels_kernel(np.ascontiguousarray(ms_arr, dtype = np.float64),
+                                       sorted_ms, float(eps))
+        matched = nearest >= 0
+    else:
+        idx = np.searchsorted(sorted_ms, ms_arr)
+        # distance to the label on each side of the insertion point
+        left = np.clip(idx - 1, 0, sorted_ms.size - 1)
+        right = np.clip(idx, 0, sorted_ms.size - 1)
+        dist_l, dist_r = np.abs(sorted_ms[left] - ms_arr), np.abs(sorted_ms[right] - ms_arr)
+        nearest = np.where(dist_r <= dist_l, right, left)
+        matched = np.minimum(dist_l, dist_r) < eps
+    match[matched] = order[nearest[matched]]
+    return match
     
 class plot_mass(Command):
     def __init__(self, args: argparse.Namespace, printf=print) -> None:
@@ -37,13 +156,7 @@ class plot_mass(Command):
         
     @staticmethod
     def process_labels(labels: str):
-        result, colors = {}, get_palette(len(labels.split(';')), mode = 'hls')
-        for idx, i in enumerate(labels.split(';')):
-            if i:
-                pack = i.split(',')
-                mass, label, color = pack[0], pack[1], pack[2] if len(pack) == 3 else colors[idx]
-                result[float(mass)] = [label, color]
-        return result
+        return _parse_labels(labels)[0]
     
     def process_args(self):          
         # process input and output args
@@ -58,40 +171,49 @@ class plot_mass(Command):
             self.args.output = None
         self.use_recursive_output = self.args.recursive and self.args.output is None
         # process labels args
-        self.args.labels = self.process_labels(self.args.labels)
+        self.args.labels, self.args._labels_ms_sorted, self.args._label_rgba = _parse_labels(self.args.labels)
         if ',' in self.args.legend_pos:
             self.args.legend_pos = self.args.legend_pos.split(',')
             self.args.legend_pos = (float(self.args.legend_pos[0]), float(self.args.legend_pos[1]))
             
     @staticmethod
     def load_file(path: Path):
-        lines = path.read_text().splitlines()
-        df = pd.DataFrame([line.split('\t') for line in lines[1:]],
-                            columns = lines[0].split('\t'))
-        if df.shape[1] == 2 and df.columns[0] == 'Time' and df.columns[1] == 'Intensity':
+        # sniff just the header line first, unrecognized files cost one line
+        # of IO instead of a full parse
+        try:
+            with path.open() as f:
+                header = f.readline().rstrip('\r\n').split('\t')
+        except OSError:
+            return put_err(f'Can not recognizable txt file: {path}, skip.')
+        if header == ['Time', 'Intensity']:
             # setattr(df, '_content_type', 'base peak') # NOTE: this does not work
-            df._attrs['content_type'] = 'base peak'
-            return df.astype(float)
-        elif df.shape[1] == 2 and df.columns[0] == 'Time' and df.columns[1] == 'Absorbance':
-            df._attrs['content_type'] = 'absorbance'
-            return df.astype(float)
-        elif df.shape[1] == 2 and df.columns[0] == 'Mass/Charge' and df.columns[1] == 'Intensity':
-            df._attrs['content_type'] = 'mass-charge'
-            return df.astype(float)
-        elif df.shape[1] == 10:
-            df._attrs['content_type'] = 'peak list'
-            df =  df.astype({'Mass/Charge':float, 'Height':float, 'Charge':int,
-                            'Monoisotopic':str, 'Mass (charge)':str,
-                            'Mass/charge (charge)':str})
-            df['Mass (charge)'] = df['Mass (charge)'].str.extract(r'(\d+\.\d+)', expand=False).astype(float)
-            df['Mass/charge (charge)'] = df['Mass/charge (charge)'].str.extract(r'(\d+\.\d+)', expand=False).astype(float)
-            return df
+            content_type = 'base peak'
+        elif header == ['Time', 'Absorbance']:
+            content_type = 'absorbance'
+        elif header == ['Mass/Charge', 'Intensity']:
+            content_type = 'mass-charge'
+        elif len(header) == 10:
+            content_type = 'peak list'
         else:
             return put_err(f'Can not recognizable txt file: {path}, skip.')
+        # parse in C with dtype inference instead of a Python split per line
+        try:
+            df = pd.read_csv(path, sep = '\t')
+        except Exception:
+            return put_err(f'Can not recognizable txt file: {path}, skip.')
+        if content_type == 'peak list':
+            df = df.astype({'Mass/Charge':float, 'Height':float, 'Charge':int,
+                            'Monoisotopic':str, 'Mass (charge)':str,
+                            'Mass/charge (charge)':str})
+            # the charge columns stay str here, filter_peaklist_data extracts
+            # only the one actually consumed as mass_data
+        df._attrs['content_type'] = content_type
+        return df
         
     @staticmethod
     def filter_peaklist_data(df: pd.DataFrame, args):
-        df['mass_data'] = df['Mass (charge)'] if args.mass else df['Mass/charge (charge)']
+        col = 'Mass (charge)' if args.mass else 'Mass/charge (charge)'
+        df['mass_data'] = pd.to_numeric(df[col].str.extract(_MASS_RE, expand = False))
         drop_idx = df[df['Height'] < args.min_height].index
         if not drop_idx.empty:
             print(f'drop data with min-height: {args.min_height} and only these data remained:\n',
@@ -108,6 +230,18 @@ class plot_mass(Command):
         if not dfs:
             raise FileNotFoundError(f'can not find txt files in {dir}')
         return dfs
+
+    @staticmethod
+    def iter_data(dir: str, recursive: bool):
+        # lazy counterpart of load_data: only one spectrum lives in RAM at a
+        # time, recursive batch runs no longer load the whole dataset up-front
+        paths = get_paths_with_extension(dir, ['txt'], recursive)
+        if not paths:
+            raise FileNotFoundError(f'can not find txt files in {dir}')
+        for path in paths:
+            df = plot_mass.load_file(Path(path))
+            if df is not None:
+                yield path, df
     
     @staticmethod
     def plot_basepeak(name:str, base_peak: pd.DataFrame, args, ax):
@@ -133,119 +267,184 @@ class plot_mass(Command):
             df = df[(df['Mass/Charge'] >= xlim[0]) & (df['Mass/Charge'] <= xlim[1])]
             print(f'x-axis data limit set to {xlim}')
         idx = df['Monoisotopic'] == 'Yes'
-        _plot_vlines(df['mass_data'], df['Height'], args.color)
-        labels_ms = np.array(list(args.labels.keys()))
-        text_col = args.color
-        for ms, h, c in zip(df['mass_data'][idx], df['Height'][idx],
-                            df['Charge'][idx]):
-            matched = np.where(np.abs(labels_ms - ms) < args.labels_eps)[0]
-            if matched.size > 0:
-                label, text_col = args.labels.get(labels_ms[matched[0]])
-                _plot_vlines([ms], [h], text_col, label)
-            else:
-                text_col = args.color
-            ax.text(ms, h, f'* {ms:.2f}({c:d})',
+        batch = {}
+        _plot_vlines(df['mass_data'], _log10_h(df['Height']), args.color, batch = batch)
+        labels_ms = _labels_ms(args)
+        ms_arr = df['mass_data'][idx].to_numpy()
+        h_arr = _log10_h(df['Height'][idx])
+        c_arr = df['Charge'][idx].to_numpy()
+        match_idx = _match_labels(ms_arr, labels_ms, args.labels_eps)
+        colors = _peak_colors(args, labels_ms, match_idx)
+        # one vectorized printf instead of a CPython f-string per peak
+        text_arr = np.char.add(np.char.mod('* %.2f(', ms_arr), np.char.mod('%d)', c_arr))
+        for i, (ms, h, mi) in enumerate(zip(ms_arr, h_arr, match_idx)):
+            text_col = tuple(colors[i])
+            if mi >= 0:
+                _plot_vlines([ms], [h], text_col, args.labels[labels_ms[mi]][0], batch = batch)
+            ax.text(ms, h, text_arr[i],
                     fontsize=args.__dict__.get('tag_fontsize', 15), color = text_col)
-        plt.yscale('log')
+        _draw_vlines_batch(batch, ax)
         axis_lim = (1-args.expand, 1+args.expand)
         y_axis_expand = args.__dict__.get('yaxis_expand', args.expand)
         y_axis_lim = (1-y_axis_expand, 1+y_axis_expand)
         plt.xlim(df['mass_data'].min() * axis_lim[0], df['mass_data'].max() * axis_lim[1])
-        plt.ylim(df['Height'].min() * y_axis_lim[0], df['Height'].max() * y_axis_lim[1])
+        _set_log_y(ax, df['Height'].min(), df['Height'].max(), y_axis_lim)
         ax.set_title(f'{name} (Peak List of TOF MS)', fontsize=25)
         ax.set_xlabel(f'Mass{"" if args.mass else "/charge"}', fontsize=25)
         ax.set_ylabel('Intensity (cps)', fontsize=25)
         
     @staticmethod
     def plot_masscharge(name: str, df: pd.DataFrame, args, ax):
-        # find peaks
-        peaks_cache_path = os.path.join(args.output, f'{name} peaks.cache.npy')
+        # find peaks, height threshold is applied inside find_peaks' C-level scan
+        min_height = max(args.min_height, df['Intensity'].max() * args.min_height_percent / 100)
+        k = max(1, int(args.min_peak_width // 2)) if args.decimate else 1
+        peaks_cache_path = os.path.join(
+            args.output,
+            f'{name} peaks.cache.{len(df)}-{args.min_peak_width}-{args.min_height}-{args.min_height_percent}-x{k}.npy')
         if args.use_peaks_cache and os.path.exists(peaks_cache_path):
-            peaks = np.load(peaks_cache_path)
+            # mmap: the indices are only scattered into the boolean mask below,
+            # no need to copy the whole array into RAM first
+            peaks = np.load(peaks_cache_path, mmap_mode = 'r')
             print(f'loaded peaks from cache: {peaks_cache_path}')
         else:
             print('searching peaks...')
-            peaks = scipy.signal.find_peaks_cwt(df['Intensity'], args.min_peak_width)
+            intens = df['Intensity'].to_numpy()
+            if k > 1:
+                # --min-peak-width declares narrower features to be noise, so a
+                # stride-k decimated scan keeps real peaks while doing 1/k work
+                peaks, _ = scipy.signal.find_peaks(intens[::k],
+                                                   width = max(1, args.min_peak_width / k),
+                                                   height = min_height)
+                peaks = peaks * k
+            else:
+                peaks, _ = scipy.signal.find_peaks(intens,
+                                                   width = args.min_peak_width, height = min_height)
+            if len(df) < 2**31: # int32 halves cache size and IO
+                peaks = peaks.astype(np.int32)
             np.save(peaks_cache_path, peaks)
-        # filter peaks
-        if peaks.any():
-            df = df.iloc[peaks, :]
+        # filter peaks: build one combined boolean mask and fancy-index once,
+        # instead of a chain of intermediate DataFrame copies
+        mask = np.zeros(len(df), dtype = bool)
+        mask[peaks] = True
+        if not mask.any(): # no peak found, still draw the raw data
+            mask[:] = True
         if args.xlim:
             xlim = [float(i) for i in args.xlim.split(',')]
             if xlim[0] > xlim[1]:
                 xlim = xlim[::-1]
                 put_err('x-axis limit error, xlim should be in ascending order, change it to [min, max]')
-            df = df[(df['Mass/Charge'] >= xlim[0]) & (df['Mass/Charge'] <= xlim[1])]
+            mz = df['Mass/Charge'].to_numpy()
+            mask &= (mz >= xlim[0]) & (mz <= xlim[1])
             print(f'x-axis data limit set to {xlim}')
-        min_height = df['Intensity'].max() * args.min_height_percent / 100
-        df = df[(df['Intensity'] >= min_height) & (df['Intensity'] >= args.min_height)]
+        df = df.iloc[np.flatnonzero(mask), :]
         print(f'min-height set to {min_height}')
         print(f'searching done. {len(df)} peaks found.')
-        df.to_csv(os.path.join(args.output, f'{name} {df._attrs["content_type"]}.csv'))
+        if args.export_csv:
+            df.to_csv(os.path.join(args.output, f'{name} {df._attrs["content_type"]}.csv'))
         # plot
-        _plot_vlines(df['Mass/Charge'], df['Intensity'], args.color)
-        labels_ms = np.array(list(args.labels.keys()))
-        text_col = args.color
-        for ms, h in zip(df['Mass/Charge'], df['Intensity']):
-            matched = np.where(np.abs(labels_ms - ms) < args.labels_eps)[0]
-            if matched.size > 0:
-                label, text_col = args.labels.get(labels_ms[matched[0]])
-                _plot_vlines([ms], [h], text_col, label)
-            else:
-                text_col = args.color
-            ax.text(ms, h, f'* {ms:.2f}',
+        batch = {}
+        _plot_vlines(df['Mass/Charge'], _log10_h(df['Intensity']), args.color, batch = batch)
+        labels_ms = _labels_ms(args)
+        ms_arr = df['Mass/Charge'].to_numpy()
+        h_arr = _log10_h(df['Intensity'])
+        match_idx = _match_labels(ms_arr, labels_ms, args.labels_eps)
+        colors = _peak_colors(args, labels_ms, match_idx)
+        text_arr = np.char.mod('* %.2f', ms_arr)
+        for i, (ms, h, mi) in enumerate(zip(ms_arr, h_arr, match_idx)):
+            text_col = tuple(colors[i])
+            if mi >= 0:
+                _plot_vlines([ms], [h], text_col, args.labels[labels_ms[mi]][0], batch = batch)
+            ax.text(ms, h, text_arr[i],
                     fontsize=args.__dict__.get('tag_fontsize', 15), color = text_col)
+        _draw_vlines_batch(batch, ax)
         # fix style
-        plt.yscale('log')
         axis_lim = (1-args.expand, 1+args.expand)
         y_axis_expand = args.__dict__.get('yaxis_expand', args.expand)
         y_axis_lim = (1-y_axis_expand, 1+y_axis_expand)
         plt.xlim(df['Mass/Charge'].min() * axis_lim[0], df['Mass/Charge'].max() * axis_lim[1])
-        plt.ylim(df['Intensity'].min() * y_axis_lim[0], df['Intensity'].max() * y_axis_lim[1])
+        _set_log_y(ax, df['Intensity'].min(), df['Intensity'].max(), y_axis_lim)
         ax.set_title(f'{name} (Mass/Charge of TOF MS)', fontsize=25)
         ax.set_xlabel(f'Mass/Charge', fontsize=25)
         ax.set_ylabel('Intensity (cps)', fontsize=25)
     
     def main_process(self):
-        dfs = self.load_data(self.args.dir, self.args.recursive)
-        # show data general info and output peak list DataFrame
-        for n,df in dfs.items():
-            path = Path(n).resolve()
-            name = path.stem
-            if self.use_recursive_output:
-                self.original_output = self.args.output
-                self.args.output = str(path.parent)
-            print(f'\n\n\n\n\n{name}: {df._attrs["content_type"]}:\n', df)
-            df.to_csv(os.path.join(self.args.output, f'{name} {df._attrs["content_type"]}.csv'))
-            # process Mass (charge) and identify mass
-            if df._attrs['content_type'] == 'peak list':
-                df = self.filter_peaklist_data(df, self.args)
-            if not df.empty:
-                # plot each df
-                print(f'plotting {name}: {df._attrs["content_type"]}')
-                fig, ax = plt.subplots(figsize=(10, 6))
-                if df._attrs["content_type"] == 'base peak':
-                    self.plot_basepeak(name, df, self.args, ax)
-                elif df._attrs["content_type"] == 'absorbance':
-                    self.plot_absorbance(name, df, self.args, ax)
-                elif df._attrs["content_type"] == 'peak list': # avoid drop all data but still draw
-                    self.plot_peaklist(name, df, self.args, ax)
-                elif df._attrs["content_type"] =='mass-charge':
-                    self.plot_masscharge(name, df, self.args, ax)
-                # style adjust and save
-                plt.xticks(size = 20);plt.yticks(size = 20)
-                plt.legend(fontsize=15, loc = self.args.legend_pos,
-                           bbox_to_anchor = (self.args.legend_pos_bbox1, self.args.legend_pos_bbox2),
-                           draggable = True)
-                save_show(os.path.join(self.args.output, f'{name} {df._attrs["content_type"]}.png'),
-                          dpi = 600, show = self.args.show_fig)
-            else:
-                print(f'no data left after filtering, skip {name}: {df._attrs["content_type"]}')
-            # recovery output path
-            if self.use_recursive_output:
-                self.output = self.original_output
+        # show data general info and output peak list DataFrame, then plot,
+        # each file is independent so they can go through a process pool;
+        # iter_data streams files one at a time instead of loading all up-front
+        if self.args.multi_process > 1:
+            with ProcessPoolExecutor(max_workers = min(self.args.multi_process, os.cpu_count()),
+                                     initializer = _worker_init) as pool:
+                list(pool.map(partial(_process_one_file, args = self.args,
+                                      use_recursive_output = self.use_recursive_output),
+                              self.iter_data(self.args.dir, self.args.recursive)))
+        else:
+            for item in self.iter_data(self.args.dir, self.args.recursive):
+                _process_one_file(item, self.args, self.use_recursive_output)
             
 
+def _worker_init():
+    # 进程池worker无GUI, 强制Agg后端
+    import matplotlib
+    matplotlib.use('Agg', force = True)
+
+
+_FIG = None
+
+def _get_fig_ax():
+    """one Figure per process, cleared between files: the Figure/Axes/
+    transform/locator stack is only built once instead of per file, and
+    figures no longer accumulate over a batch run."""
+    global _FIG
+    if _FIG is None:
+        _FIG = plt.figure(figsize = (10, 6))
+    else:
+        _FIG.clear()
+        plt.figure(_FIG.number) # keep it current for the plt.*-style calls
+    return _FIG.add_subplot(111)
+
+
+def _process_one_file(item, args, use_recursive_output: bool):
+    n, df = item
+    path = Path(n).resolve()
+    name = path.stem
+    original_output = args.output
+    if use_recursive_output:
+        args.output = str(path.parent)
+    try:
+        print(f'\n\n\n\n\n{name}: {df._attrs["content_type"]}:\n', df)
+        # the up-front export only ever differs from the raw txt for peak-list
+        # frames (mass columns get extracted), skip it elsewhere
+        if args.export_csv and df._attrs['content_type'] == 'peak list':
+            df.to_csv(os.path.join(args.output, f'{name} {df._attrs["content_type"]}.csv'))
+        # process Mass (charge) and identify mass
+        if df._attrs['content_type'] == 'peak list':
+            df = plot_mass.filter_peaklist_data(df, args)
+        if not df.empty:
+            # plot each df
+            print(f'plotting {name}: {df._attrs["content_type"]}')
+            ax = _get_fig_ax()
+            if df._attrs["content_type"] == 'base peak':
+                plot_mass.plot_basepeak(name, df, args, ax)
+            elif df._attrs["content_type"] == 'absorbance':
+                plot_mass.plot_absorbance(name, df, args, ax)
+            elif df._attrs["content_type"] == 'peak list': # avoid drop all data but still draw
+                plot_mass.plot_peaklist(name, df, args, ax)
+            elif df._attrs["content_type"] =='mass-charge':
+                plot_mass.plot_masscharge(name, df, args, ax)
+            # style adjust and save
+            plt.xticks(size = 20);plt.yticks(size = 20)
+            plt.legend(fontsize=15, loc = args.legend_pos,
+                       bbox_to_anchor = (args.legend_pos_bbox1, args.legend_pos_bbox2),
+                       draggable = True)
+            save_show(os.path.join(args.output, f'{name} {df._attrs["content_type"]}.{args.format}'),
+                      dpi = args.dpi, show = args.show_fig)
+        else:
+            print(f'no data left after filtering, skip {name}: {df._attrs["content_type"]}')
+    finally:
+        # recovery output path
+        args.output = original_output
+
+
 class explore_mass(plot_mass):
     from nicegui import ui
     def __init__(self, args: argparse.Namespace, printf=print) -> None:
@@ -266,7 +465,7 @@ class explore_mass(plot_mass):
         plt.close(self.fig)
         with ui.pyplot(figsize=(self.args.fig_w, self.args.fig_h), close = False) as fig:
             # process labels
-            self.args.labels = self.process_labels(self.args.labels_string)
+            self.args.labels, self.args._labels_ms_sorted, self.args._label_rgba = _parse_labels(self.args.labels_string)
             # process io path
             if self.use_recursive_output:
                 self.original_output = self.args.output
@@ -318,7 +517,7 @@ class explore_mass(plot_mass):
                             title = '', xlabel = 'Mass/Charge', ylabel = 'Intensity (cps)',
                             xticks_fontsize = 20, yticks_fontsize = 20, tag_fontsize = 15,
                             axis_label_fontsizes = 25, title_fontsize = 25, legend_fontsize = 15,
-                            fig_w = 10, fig_h = 8, dpi = 600, file_name = '', yaxis_expand = 0.1,
+                            fig_w = 10, fig_h = 8, file_name = '', yaxis_expand = 0.1,
                             **self.args.__dict__)
         # GUI
         with ui.header(elevated=True).style('background-color: #3874c8'):
@@ -435,6 +634,16 @@ def main(sys_args: List[str] = None):
                                 help='legend position bbox 2 to anchor, default is %(default)s')
     plot_mass_args.add_argument('-sf', '--show-fig', action='store_true', default=False,
                                 help='automatically show figure, default is %(default)s')
+    plot_mass_args.add_argument('-mp', '--multi-process', type = int, default=1,
+                                help='process files in parallel with this many processes, default is %(default)s')
+    plot_mass_args.add_argument('--export-csv', action='store_true', default=False,
+                                help='export processed data as csv besides the figure, default is %(default)s')
+    plot_mass_args.add_argument('--decimate', action='store_true', default=False,
+                                help='decimate intensity by min-peak-width//2 before peak search, default is %(default)s')
+    plot_mass_args.add_argument('--dpi', type = int, default=300,
+                                help='figure output DPI, default is %(default)s')
+    plot_mass_args.add_argument('--format', type = str, default='png', choices=['png', 'svg'],
+                                help='figure output format, svg skips PNG encoding entirely, default is %(default)s')
 
     explore_mass_args = subparsers.add_parser('explore-mass', description='explore mass spectrum data')
     for action in plot_mass_args._actions:
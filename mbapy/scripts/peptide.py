@@ -3,8 +3,9 @@ import itertools
 import os
 import math
 import sys
-from copy import deepcopy
+from collections import deque
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List
 
@@ -14,11 +15,21 @@ from tqdm import tqdm
 os.environ['MBAPY_AUTO_IMPORT_TORCH'] = 'False'
 os.environ['MBAPY_FAST_LOAD'] = 'True'
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# dataclass(slots=True) needs py3.10+, fall back to plain dataclass before that
+if sys.version_info >= (3, 10):
+    _slots_dataclass = partial(dataclass, slots = True)
+else:
+    _slots_dataclass = dataclass
+
 # if __name__ == '__main__':
-from mbapy.base import put_err, split_list
+from mbapy.base import put_err
 from mbapy.bio.peptide import AnimoAcid, Peptide
 from mbapy.file import opts_file, get_valid_file_path
-from mbapy.web import TaskPool
 from mbapy.scripts._script_utils_ import clean_path, show_args
 # else:
 #     from ..base import put_err
@@ -33,8 +44,8 @@ def calcu_substitution_value(args: argparse.Namespace):
     regression model. The function first processes the input arguments to 
     convert the strings to float values and stores them in arrays. It then 
     calculates the average substitution value and prints it on the console. 
-    Next, the function fits a linear regression model to the data using the 
-    LinearRegression class from scikit-learn and calculates the equation 
+    Next, the function fits a linear regression model to the data using
+    numpy's polyfit and calculates the equation
     parameters and R-squared value for the fit. Finally, it plots the linear 
     regression line on the scatter plot using matplotlib and displays the 
     equation and R-squared value using text annotations.
@@ -46,8 +57,7 @@ def calcu_substitution_value(args: argparse.Namespace):
     """
     import matplotlib.pyplot as plt
     import seaborn as sns
-    from sklearn.linear_model import LinearRegression
-    
+
     a = np.array([float(i) for i in args.absorbance.split(',') if len(i)])
     m = np.array([float(i) for i in args.weight.split(',') if len(i)])
     mean_subval = np.mean(args.coff*a/m)
@@ -58,10 +68,10 @@ def calcu_substitution_value(args: argparse.Namespace):
     ax.set_xlim(0, max(20, m.max()*1.2))
     ax.set_ylim(0, max(0.4, a.max()*1.2))
 
-    regressor = LinearRegression()
-    regressor = regressor.fit(m.reshape(-1, 1), a.reshape(-1, 1))
-    equation_a, equation_b = regressor.coef_.item(), regressor.intercept_.item()
-    equation_r2 = '{:4.3f}'.format(regressor.score(m.reshape(-1, 1), a.reshape(-1, 1)))
+    equation_a, equation_b = np.polyfit(m, a, 1)
+    pred = equation_a * m + equation_b
+    ss_res, ss_tot = ((a - pred)**2).sum(), ((a - a.mean())**2).sum()
+    equation_r2 = '{:4.3f}'.format(1 - ss_res / ss_tot)
     sns.regplot(x = m, y = a, color = 'black', marker = 'o', truncate = False, ax = ax)
 
     equationStr = f'OD = {equation_a:5.4f} * m {" " if equation_b<0 else "+ ":}{equation_b:5.4f}'
@@ -106,18 +116,18 @@ def calcu_mw(args: argparse.Namespace, _print = print):
     return peptide, expand_mw_dict
     
     
-@dataclass
+@_slots_dataclass(frozen = True)
 class MutationOpts:
     AA_deletion: bool = True # whether delete AA can be performed
     AA_repeat: int = 1 # AA repeat times of AA
     N_protect_deletion: bool = True # whether delete N-terminal protect group can be performed
     C_protect_deletion: bool = True # whether delete C-terminal protect group can be performed
     R_protect_deletion: bool = True # whether delete R-terminal protect group can be performed
-    
+
     def copy(self):
-        return MutationOpts(self.AA_deletion, self.AA_repeat, self.N_protect_deletion,
-                            self.C_protect_deletion, self.R_protect_deletion)
-    
+        # frozen value object, every holder can share the same instance
+        return self
+
     def check_empty(self, _pos: List[int], seq: Peptide, args: argparse.Namespace):
         """
         return list of signals which is able to opt, if empty, the lis is also empty.
@@ -159,9 +169,9 @@ class MutationOpts:
         tree.mutate.seq.AAs[pos] = []
         #  mutate branch MOVE TO NEXT NEW AA
         tree.mutate.pos[0] += 1
-        tree.mutate.opts = MutationOpts(AA_repeat=max_repeat)
+        tree.mutate.opts = _mk_opts(AA_repeat=max_repeat)
         # trun off the delete AA opt in remain branch
-        tree.remain.opts.AA_deletion = False
+        tree.remain.opts = _opts_with(tree.remain.opts, AA_deletion=False)
         return tree
     
     def repeat_AA(self, tree: 'MutationTree'):
@@ -186,9 +196,9 @@ class MutationOpts:
         # change mutate branch 's pos 's sum_repeat to tree.opts.repeat_AA + 1
         tree.mutate.pos[2] = tree.opts.AA_repeat + 1
         # trun off the repeat AA opts in mutate branches
-        tree.mutate.opts = MutationOpts(AA_repeat=0)
+        tree.mutate.opts = _mk_opts(AA_repeat=0)
         # decrease the repeat AA opts in remain branches
-        tree.remain.opts.AA_repeat -= 1
+        tree.remain.opts = _opts_with(tree.remain.opts, AA_repeat=tree.remain.opts.AA_repeat - 1)
         return tree        
 
     def delete_NCR(self, tree: 'MutationTree', NCR: str):
@@ -206,8 +216,8 @@ class MutationOpts:
         elif sum_repeat > 1 and getattr(tree.mutate.seq.AAs[pos][repeat_pos], f'{NCR}_protect') != null_pg:
             setattr(tree.mutate.seq.AAs[pos][repeat_pos], f'{NCR}_protect', null_pg)
         # trun off the opts in two branches
-        setattr(tree.mutate.opts, f'{NCR}_protect_deletion', False)
-        setattr(tree.remain.opts, f'{NCR}_protect_deletion', False)
+        tree.mutate.opts = _opts_with(tree.mutate.opts, **{f'{NCR}_protect_deletion': False})
+        tree.remain.opts = _opts_with(tree.remain.opts, **{f'{NCR}_protect_deletion': False})
         return tree
                 
     def perform_one(self, tree: 'MutationTree', args: argparse.Namespace):
@@ -227,7 +237,7 @@ class MutationOpts:
         """
         able = tree.opts.check_empty(tree.pos, tree.seq, args)
         if able:
-            # generate two branch and set seq to None to free memory
+            # generate two branch
             tree.generate_two_branch()
             # perform mutation
             if 'AA_deletion' in able:
@@ -242,10 +252,33 @@ class MutationOpts:
                 tree = self.delete_NCR(tree, 'R')
             else:
                 raise ValueError('error when check empty with MutationOpts')
+            # branches hold their own seq/opts copies now, free them on this interior dot
+            tree.seq = None
+            tree.opts = None
         # return tree
         return tree
-    
-@dataclass
+
+
+@lru_cache(maxsize = None)
+def _mk_opts(AA_deletion: bool = True, AA_repeat: int = 1, N_protect_deletion: bool = True,
+             C_protect_deletion: bool = True, R_protect_deletion: bool = True):
+    """interned MutationOpts factory: only ~2^4 * (max_repeat+1) distinct
+    value-tuples ever exist, so share one frozen instance per tuple."""
+    return MutationOpts(AA_deletion, AA_repeat, N_protect_deletion,
+                        C_protect_deletion, R_protect_deletion)
+
+
+def _opts_with(opts: MutationOpts, **changes):
+    """interned copy of opts with some fields replaced."""
+    kwargs = dict(AA_deletion = opts.AA_deletion, AA_repeat = opts.AA_repeat,
+                  N_protect_deletion = opts.N_protect_deletion,
+                  C_protect_deletion = opts.C_protect_deletion,
+                  R_protect_deletion = opts.R_protect_deletion)
+    kwargs.update(changes)
+    return _mk_opts(**kwargs)
+
+
+@_slots_dataclass
 class MutationTree:
     peptide: Peptide # mother peptide, READ ONLY, remians unchanged
     seq: Peptide # this dot's peptide seqeunce to perform mutate
@@ -256,26 +289,21 @@ class MutationTree:
     remain: 'MutationTree' = None # father dot
     mutate: 'MutationTree' = None # father dot
     
-    def copy(self, copy_peptide: bool = False, copy_branch: bool = False,
+    def copy(self, copy_peptide: bool = False,
              father: 'MutationTree' = None, remain: 'MutationTree' = None,
              mutate: 'MutationTree' = None):
         """
         Params:
             - copy_peptide: bool, whether to copy mother peptide.
-            - copy_branch: bool, whether to copy father, remain, mutate branch via deepcopy. If False, leave it None.
+            - father/remain/mutate: branch links of the copy, left None by default.
         """
         if copy_peptide:
             cp = MutationTree(self.peptide.copy(), self.seq.copy(), self.opts.copy(), [i for i in self.pos])
         else:
             cp = MutationTree(self.peptide, self.seq.copy(), self.opts.copy(), [i for i in self.pos])
-        if copy_branch:
-            cp.father = deepcopy(self.father)
-            cp.remain = deepcopy(self.remain)
-            cp.mutate = deepcopy(self.mutate)
-        else:
-            cp.father = father
-            cp.remain = remain
-            cp.mutate = mutate
+        cp.father = father
+        cp.remain = remain
+        cp.mutate = mutate
         return cp
     
     def extract_mutations(self, flatten: bool = True):
@@ -322,7 +350,7 @@ class MutationTree:
                 # move to next repeat AA
                 self.pos[1] += 1
             # reset opts to full
-            self.opts = MutationOpts(AA_repeat = max_repeat)
+            self.opts = _mk_opts(AA_repeat = max_repeat)
             return True
         return False
         
@@ -331,43 +359,161 @@ def mutate_peptide(tree: MutationTree, args: argparse.Namespace):
     Parameters:
         - mutations: Tree object, store all mutations and there relationship.
         - max_repeat: int
+
+    iterative with an explicit work-stack: the tree doubles at every mutation
+    decision, recursion would pay a Python frame per dot and hit the recursion
+    limit on long sequences.
     """
-    # perofrm ONE mutation
-    tree = tree.opts.perform_one(tree, args)
-    # if NO mutaion can be done, 
-    if tree.mutate is None and tree.remain is None:
-        # try move current AA in this tree to next AA
-        if tree.move_to_next(args.max_repeat):
-            # move success, go on
-            mutate_peptide(tree, args)
-        else:
-            # it is the end, return tree
-            return tree
-    else: # go on with two branches
-        mutate_peptide(tree.mutate, args)
-        mutate_peptide(tree.remain, args)
+    stack = deque([tree])
+    while stack:
+        t = stack.pop()
+        # perofrm ONE mutation
+        t = t.opts.perform_one(t, args)
+        # if NO mutaion can be done,
+        if t.mutate is None and t.remain is None:
+            # try move current AA in this dot to next AA, else it is a leaf
+            if t.move_to_next(args.max_repeat):
+                stack.append(t)
+        else: # go on with two branches
+            stack.append(t.mutate)
+            stack.append(t.remain)
     return tree
 
-def calcu_mutations_mw(seqs: List[Peptide], mass: bool = False, verbose: bool = True):
+# AA variants (animo_acid, N/C/R protect) interned to integer ids so the MW
+# aggregation runs over flat int arrays instead of per-AA method calls;
+# id 0 is reserved as padding
+_AA_IDS: Dict[tuple, int] = {}
+_AA_MW: List[float] = [0.0]
+_AA_MASS: List[float] = [0.0]
+_TABLE_VERSION = 0
+_TABLE_CACHE: Dict[bool, tuple] = {}
+_H2O_MW = 18.02 # per peptide bond, same constant as Peptide.calcu_mw
+_H2O_MASS = None
+
+
+def _h2o_mass():
+    global _H2O_MASS
+    if _H2O_MASS is None:
+        from pyteomics import mass as _pmass
+        _H2O_MASS = _pmass.calculate_mass(formula = 'H2O')
+    return _H2O_MASS
+
+
+def _encode_AAs(AAs: List[AnimoAcid], mass: bool = False):
+    """intern each AA variant and return the id array; fills the mass table
+    lazily because exact mass needs pyteomics."""
+    global _TABLE_VERSION
+    ids = np.empty(len(AAs), dtype = np.int32)
+    for i, aa in enumerate(AAs):
+        key = (aa.animo_acid, aa.N_protect, aa.C_protect, aa.R_protect)
+        aa_id = _AA_IDS.get(key)
+        if aa_id is None:
+            aa_id = _AA_IDS[key] = len(_AA_MW)
+            _AA_MW.append(aa.calcu_mw())
+            _AA_MASS.append(None)
+            _TABLE_VERSION += 1
+        if mass and _AA_MASS[aa_id] is None:
+            _AA_MASS[aa_id] = aa.calcu_mass()
+            _TABLE_VERSION += 1
+        ids[i] = aa_id
+    return ids
+
+
+def _get_mass_table(mass: bool = False):
+    """np.float64 view of the interned masses, rebuilt only when new AA
+    variants were interned since the last call."""
+    ver, arr = _TABLE_CACHE.get(mass, (-1, None))
+    if ver != _TABLE_VERSION:
+        src = _AA_MASS if mass else _AA_MW
+        arr = np.array([v if v is not None else 0.0 for v in src], dtype = np.float64)
+        _TABLE_CACHE[mass] = (_TABLE_VERSION, arr)
+    return arr
+
+
+if numba is not None:
+    @numba.njit(cache = True)
+    def _sum_mw(ids, table): # pragma: no cover
+        s = 0.0
+        for i in range(ids.size):
+            s += table[ids[i]]
+        return s
+else:
+    def _sum_mw(ids, table):
+        # keep the same left-to-right summation order as the jitted kernel
+        s = 0.0
+        for aa_id in ids:
+            s += table[aa_id]
+        return s
+
+
+def _calcu_pep_mw(ids: np.ndarray, mass: bool = False):
+    bond = _h2o_mass() if mass else _H2O_MW
+    return _sum_mw(ids, _get_mass_table(mass)) - (len(ids) - 1) * bond
+
+
+def _batch_mw_kernel(ids_list: List[np.ndarray], table: np.ndarray, bond: float):
+    """MWs for a batch of encoded peptides in one shot: stack the id arrays
+    into a padded (N, maxlen) int32 matrix and gather-sum over the mass table
+    along axis 1. Padding id 0 maps to mass 0.0, the mask keeps that explicit.
+    The table is an explicit argument so the kernel can run in worker
+    processes whose own intern tables are empty."""
+    lengths = np.array([len(ids) for ids in ids_list], dtype = np.int64)
+    arr = np.zeros((len(ids_list), int(lengths.max())), dtype = np.int32)
+    for i, ids in enumerate(ids_list):
+        arr[i, :len(ids)] = ids
+    mask = arr != 0
+    vals = table[arr] * mask
+    # accumulate column by column: vectorized over peptides but keeps the
+    # per-peptide left-to-right addition order of the scalar path
+    mws = np.zeros(len(ids_list), dtype = np.float64)
+    for j in range(vals.shape[1]):
+        mws += vals[:, j]
+    return mws - (lengths - 1) * bond
+
+
+def _calcu_batch_mw(ids_list: List[np.ndarray], mass: bool = False):
+    return _batch_mw_kernel(ids_list, _get_mass_table(mass),
+                            _h2o_mass() if mass else _H2O_MW)
+
+
+def calcu_mutations_mw(seqs, mass: bool = False, verbose: bool = True, total: int = None,
+                       n_jobs: int = 1, batch_size: int = 500000):
     peps, mw2pep = {}, {}
-    for pep in tqdm(seqs,
+    ids_list, pep_list = [], []
+    for pep in tqdm(seqs, total=total,
                     desc='Gathering mutations and Calculating molecular weight',
                     disable=not verbose):
         full_pep = Peptide(None)
-        full_pep.AAs.extend(aa.AAs for aa in pep)
-        full_pep.flatten(inplace = True)
+        # leaves' seq are already flattened by extract_mutations, so one
+        # comprehension builds the flat AA list without a flatten() pass
+        full_pep.AAs = [aa for sub in pep for aa in sub.AAs]
         if len(full_pep.AAs):
-            pep_repr = str(full_pep)
-            if pep_repr not in peps:
-                peps[pep_repr] = len(peps)
-                if mass:
-                    mw = full_pep.calcu_mass()
-                else:
-                    mw = full_pep.calcu_mw()
-                if mw in mw2pep:
-                    mw2pep[mw].append(full_pep)
-                else:
-                    mw2pep[mw] = [full_pep]
+            ids = _encode_AAs(full_pep.AAs, mass)
+            # bytes of the id array dedup cheaper than a formatted repr str;
+            # setdefault keeps it to one hash lookup per candidate
+            pep_key, n = ids.tobytes(), len(peps)
+            if peps.setdefault(pep_key, n) == n:
+                ids_list.append(ids)
+                pep_list.append(full_pep)
+    if not ids_list:
+        return peps, mw2pep
+    # all MWs in one padded gather-sum, then group by unique MW
+    if n_jobs > 1 and len(ids_list) > batch_size:
+        # ship only int32 id arrays and the flat mass table to loky workers,
+        # peptide object graphs stay in the parent
+        from joblib import Parallel, delayed
+        table = _get_mass_table(mass)
+        bond = _h2o_mass() if mass else _H2O_MW
+        chunks = [ids_list[i:i + batch_size] for i in range(0, len(ids_list), batch_size)]
+        mws = np.concatenate(Parallel(n_jobs = n_jobs, backend = 'loky')(
+            delayed(_batch_mw_kernel)(chunk, table, bond) for chunk in chunks))
+    else:
+        mws = _calcu_batch_mw(ids_list, mass)
+    uniq, inverse = np.unique(mws, return_inverse = True)
+    for i, pep in enumerate(pep_list):
+        # quantize to the 5 decimals the output prints anyway, so peptides
+        # whose sums differ only in the last ulp share one key
+        mw2pep.setdefault(round(float(uniq[inverse[i]]), 5), []).append(pep)
     return peps, mw2pep
 
 def calcu_mw_of_mutations(args: argparse.Namespace):
@@ -426,29 +572,16 @@ def calcu_mw_of_mutations(args: argparse.Namespace):
         pep = Peptide(None)
         pep.AAs = [aa.copy()]
         aa_mutations = MutationTree(peptide=pep, seq=pep.copy(),
-                                    opts=MutationOpts(AA_repeat=args.max_repeat),
+                                    opts=_mk_opts(AA_repeat=args.max_repeat),
                                     pos=[0, 0, 1])
         aa_mutations = mutate_peptide(aa_mutations, args)
         seq.append(aa_mutations.extract_mutations())
     # gather mutations, calcu mw and store in dict
-    seqs = list(itertools.product(*seq))
-    if args.multi_process == 1:
-        peps, mw2pep = calcu_mutations_mw(seqs, mass=args.mass, verbose=True)
-    else:
-        print('Gathering mutations and Calculating molecular weight...')
-        peps, mw2pep = {}, {}
-        pool = TaskPool('process', args.multi_process)
-        for i, batch in enumerate(split_list(seqs, args.process_batch)):
-            pool.add_task(f'{i}', calcu_mutations_mw, batch, args.mass, False)
-        pool.run()
-        pool.wait_till(lambda : pool.count_done_tasks() == len(pool.tasks), verbose=True)
-        for (_, (peps_i, mw2pep_i), _) in pool.tasks.values():
-            peps.update(peps_i)
-            for i in mw2pep_i:
-                if i in mw2pep:
-                    mw2pep[i].extend(mw2pep_i[i])
-                else:
-                    mw2pep[i] = mw2pep_i[i]
+    # stream the Cartesian product instead of materializing the full list
+    seqs = itertools.product(*seq)
+    total = math.prod(len(s) for s in seq)
+    peps, mw2pep = calcu_mutations_mw(seqs, mass=args.mass, verbose=True, total=total,
+                                      n_jobs=args.multi_process, batch_size=args.process_batch)
     # output info
     _print(f'\n{len(peps)-1} mutations found, followings include one original peptide seqeunce:\n', f)
     if verbose: